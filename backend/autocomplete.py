@@ -0,0 +1,198 @@
+"""
+In-memory prefix index used to serve formula / IUPAC name suggestions.
+"""
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AutocompleteIndex:
+    """
+    Prefix index over formulas and IUPAC names, ranked by popularity.
+
+    Search keys are kept lowercased in a sorted list so a prefix lookup is a
+    bisect followed by a scan of the matching range. Each compound (keyed by
+    its formula) can be reached through its formula and its IUPAC name.
+
+    Prefixes whose range is longer than ``scan_limit`` keys (short prefixes
+    such as "c") get their ``top_k`` most popular compounds cached. ``add``
+    only raises popularity, so it updates these lists in place; lists holding
+    a compound that is evicted or loses uses through ``remove`` are dropped
+    and rebuilt on the next search.
+
+    The number of compounds is capped at ``max_entries``; when the cap is hit
+    a new compound replaces the least popular one and inherits its count
+    (Space-Saving), so counts may overestimate but frequent compounds are
+    never locked out. The least popular compound is found through a min-heap
+    of ``(popularity, formula)`` entries (outdated entries are skipped lazily).
+    """
+
+    def __init__(self, max_entries: int = 10000, top_k: int = 50, scan_limit: int = 200):
+        self.max_entries = max_entries
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, str]] = []  # sorted (search_key, formula) pairs
+        self._popularity: Dict[str, int] = {}
+        self._names: Dict[str, Optional[str]] = {}
+        self._heap: List[Tuple[int, str]] = []  # (popularity, formula), may hold outdated entries
+        self._top: Dict[str, List[str]] = {}  # prefix -> most popular formulas, best first
+
+    def __len__(self) -> int:
+        return len(self._popularity)
+
+    def add(self, formula: str, iupac_name: Optional[str] = None, count: int = 1) -> None:
+        """
+        Record ``count`` uses of a compound, inserting it if it is new.
+
+        Args:
+            formula: Chemical formula as entered by the user
+            iupac_name: IUPAC name from PubChem, if known
+            count: Number of uses to add to the compound's popularity
+        """
+        if not formula:
+            return
+        with self._lock:
+            if formula in self._popularity:
+                self._popularity[formula] += count
+                if iupac_name and not self._names.get(formula):
+                    self._names[formula] = iupac_name
+                    insort(self._keys, (iupac_name.lower(), formula))
+            else:
+                if len(self._popularity) >= self.max_entries:
+                    # Space-Saving: the newcomer takes over the evicted count, so
+                    # a compound used repeatedly always gets in eventually
+                    least_popular = self._least_popular()
+                    count += self._popularity[least_popular]
+                    self._remove(least_popular)
+                self._popularity[formula] = count
+                self._names[formula] = iupac_name
+                insort(self._keys, (formula.lower(), formula))
+                if iupac_name:
+                    insort(self._keys, (iupac_name.lower(), formula))
+
+            heapq.heappush(self._heap, (self._popularity[formula], formula))
+            if len(self._heap) > 2 * len(self._popularity) + 64:
+                self._heap = [(popularity, f) for f, popularity in self._popularity.items()]
+                heapq.heapify(self._heap)
+            self._update_top(formula)
+
+    def _least_popular(self) -> str:
+        """Formula of the least popular compound. Caller must hold the lock."""
+        heap = self._heap
+        while self._popularity.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def _cached_prefixes(self, formula: str):
+        """Cached prefixes of any of the compound's search keys. Caller must hold the lock."""
+        for key in {formula.lower(), (self._names.get(formula) or "").lower()}:
+            for end in range(1, len(key) + 1):
+                if key[:end] in self._top:
+                    yield key[:end]
+
+    def _update_top(self, formula: str) -> None:
+        """Re-rank a compound whose popularity grew in the cached top lists. Caller must hold the lock."""
+        rank = (self._popularity[formula], formula)
+        for prefix in set(self._cached_prefixes(formula)):
+            top = self._top[prefix]
+            if formula in top:
+                top.remove(formula)
+            elif len(top) >= self.top_k and rank < (self._popularity[top[-1]], top[-1]):
+                continue
+            pos = 0
+            while pos < len(top) and (self._popularity[top[pos]], top[pos]) > rank:
+                pos += 1
+            top.insert(pos, formula)
+            del top[self.top_k:]
+
+    def remove(self, formula: str, count: Optional[int] = None) -> None:
+        """
+        Forget ``count`` uses of a compound, e.g. after history rows are deleted.
+
+        Args:
+            formula: Chemical formula as stored in history
+            count: Number of uses to subtract; the compound is dropped once
+                none are left, or straight away if None
+        """
+        with self._lock:
+            if formula not in self._popularity:
+                return
+            if count is None or self._popularity[formula] <= count:
+                self._remove(formula)
+                return
+            self._popularity[formula] -= count
+            heapq.heappush(self._heap, (self._popularity[formula], formula))
+            self._invalidate_top(formula)
+
+    def _invalidate_top(self, formula: str) -> None:
+        """Drop cached top lists a compound is ranked in. Caller must hold the lock."""
+        for prefix in set(self._cached_prefixes(formula)):
+            if formula in self._top[prefix]:
+                del self._top[prefix]
+
+    def _remove(self, formula: str) -> None:
+        """Drop a compound and its search keys. Caller must hold the lock."""
+        self._invalidate_top(formula)
+        iupac_name = self._names.pop(formula, None)
+        del self._popularity[formula]
+        for key in (formula, iupac_name):
+            if not key:
+                continue
+            pos = bisect_left(self._keys, (key.lower(), formula))
+            if pos < len(self._keys) and self._keys[pos] == (key.lower(), formula):
+                del self._keys[pos]
+
+    def search(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Return up to ``limit`` compounds whose formula or name starts with ``prefix``.
+
+        Args:
+            prefix: Case-insensitive prefix typed by the user
+            limit: Maximum number of suggestions
+
+        Returns:
+            List[Dict]: Suggestions ordered by popularity (most used first)
+        """
+        prefix = prefix.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is None or limit > self.top_k:
+                keys = self._keys
+                start = bisect_left(keys, (prefix,))
+                end = bisect_left(keys, (prefix + "\uffff",), start)
+                matches = {keys[i][1] for i in range(start, end)}
+                top = heapq.nlargest(max(limit, self.top_k), matches, key=lambda f: (self._popularity[f], f))
+                if end - start > self.scan_limit:
+                    self._top[prefix] = top[:self.top_k]
+            return [
+                {"formula": f, "iupac_name": self._names.get(f), "count": self._popularity[f]}
+                for f in top[:limit]
+            ]
+
+    def load(self, rows) -> None:
+        """
+        Rebuild the index from ``(formula, iupac_name, count)`` rows.
+
+        Args:
+            rows: Iterable of aggregated history rows
+        """
+        with self._lock:
+            self._keys = []
+            self._popularity = {}
+            self._names = {}
+            self._heap = []
+            self._top = {}
+        for formula, iupac_name, count in rows:
+            self.add(formula, iupac_name, count or 1)
+        logger.info(f"Autocomplete index loaded with {len(self)} compounds")
+
+
+# Shared index used by the API
+autocomplete_index = AutocompleteIndex()
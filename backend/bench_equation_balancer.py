@@ -0,0 +1,68 @@
+"""
+Benchmark for the equation balancing engine.
+
+Measures cold (nullspace computed) and memoized balancing time for known
+multi-species redox equations and for synthetic oxidation reactions with a
+growing number of species.
+
+Usage:
+    python bench_equation_balancer.py [repetitions]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append('.')
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["CACHE_WARMUP_ENABLED"] = "false"
+
+from main import equation_balancer
+
+KNOWN_EQUATIONS = [
+    "K4Fe(SCN)6 + K2Cr2O7 + H2SO4 -> Fe2(SO4)3 + Cr2(SO4)3 + CO2 + H2O + K2SO4 + KNO3",
+    "(Cr(N2H4CO)6)4(Cr(CN)6)3 + KMnO4 + H2SO4 -> K2Cr2O7 + MnSO4 + CO2 + KNO3 + K2SO4 + H2O",
+]
+
+# Element and the oxide it forms, used to build synthetic equations
+OXIDES = [
+    ("Na", "Na2O"), ("K", "K2O"), ("Mg", "MgO"), ("Ca", "CaO"), ("Al", "Al2O3"),
+    ("Si", "SiO2"), ("P", "P4O10"), ("S", "SO3"), ("Fe", "Fe2O3"), ("Cu", "CuO"),
+    ("Zn", "ZnO"), ("C", "CO2"), ("Ba", "BaO"), ("Li", "Li2O"), ("Ti", "TiO2"),
+    ("Mn", "MnO2"), ("Ni", "NiO"), ("Cr", "Cr2O3"), ("B", "B2O3"), ("Sr", "SrO"),
+    ("V", "V2O5"), ("Ge", "GeO2"),
+]
+
+
+def synthetic_equation(species: int) -> str:
+    """Oxidation of a mixed compound into ``species - 2`` oxides."""
+    pairs = OXIDES[:species - 2]
+    compound = "".join(f"{element}{i + 2}" for i, (element, _) in enumerate(pairs))
+    return f"{compound} + O2 -> " + " + ".join(oxide for _, oxide in pairs)
+
+
+def time_per_call(equation: str, repetitions: int, cold: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        if cold:
+            equation_balancer.clear_cache()
+        equation_balancer.balance(equation)
+    return (time.perf_counter() - started) / repetitions * 1_000_000
+
+
+def main(repetitions: int) -> None:
+    logging.disable(logging.INFO)
+    cases = [(f"known ({len(e.replace('->', '+').split('+'))} species)", e) for e in KNOWN_EQUATIONS]
+    cases += [(f"synthetic ({n} species)", synthetic_equation(n)) for n in (10, 14, 18, 24)]
+
+    print(f"{'equation':<26}{'cold us/op':>14}{'memoized us/op':>16}")
+    for name, equation in cases:
+        cold = time_per_call(equation, repetitions, cold=True)
+        warm = time_per_call(equation, repetitions * 10, cold=False)
+        print(f"{name:<26}{cold:>14.1f}{warm:>16.1f}")
+    print(f"\nLargest balanced: {equation_balancer.balance(synthetic_equation(24))['equation']}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
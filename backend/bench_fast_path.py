@@ -0,0 +1,95 @@
+"""
+Benchmark for the /molar-mass and /history fast paths.
+
+Compares requests/sec of the current endpoints against the previous
+implementation (dict -> FormulaResponse validation -> default JSON encoder,
+ORM rows -> FormulaHistoryModel via orm_mode), registered here under /legacy.
+PubChem is not contacted: the property cache is pre-filled.
+
+Usage:
+    python bench_fast_path.py [requests_per_case]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.append('.')
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["CACHE_WARMUP_ENABLED"] = "false"
+
+from fastapi import Depends, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import main
+from database import FormulaHistory, get_db
+from fast_json import orjson
+from pubchem_api import property_cache
+
+FORMULAS = ["H2O", "CO2", "C6H12O6", "NaCl", "H2SO4", "C2H5OH", "CaCO3", "NH3"]
+PROPERTIES = {
+    "boiling_point": "100 °C",
+    "melting_point": "0 °C",
+    "density": "0.997 g/mL at 25 °C",
+    "state_at_room_temp": "Liquid",
+    "iupac_name": "oxidane",
+    "hazard_classification": "Not classified",
+    "structure_image_url": "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/962/PNG",
+    "structure_image_svg_url": None,
+    "compound_url": "https://pubchem.ncbi.nlm.nih.gov/compound/962",
+}
+
+
+@main.app.post("/legacy/molar-mass", response_model=main.FormulaResponse)
+def legacy_molar_mass(request: main.FormulaRequest, db: Session = Depends(get_db), req: Request = None):
+    main.validate_formula(request.formula)
+    molar_mass = main.calculate_molar_mass(request.formula)
+    properties = main.get_chemical_properties(request.formula)
+    result = {"formula": request.formula, "molar_mass": round(molar_mass, 4), "unit": "g/mol"}
+    result.update({key: properties.get(key) for key in PROPERTIES})
+    main._save_to_database(db, request.formula, molar_mass, properties, req)
+    return result
+
+
+@main.app.get("/legacy/history", response_model=List[main.FormulaHistoryModel])
+def legacy_history(limit: int = 10, db: Session = Depends(get_db)):
+    return db.query(FormulaHistory).order_by(FormulaHistory.timestamp.desc()).limit(limit).all()
+
+
+def requests_per_second(send, count: int) -> float:
+    started = time.perf_counter()
+    for i in range(count):
+        response = send(i)
+        assert response.status_code == 200, response.text
+    return count / (time.perf_counter() - started)
+
+
+def main_benchmark(count: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for formula in FORMULAS:
+        property_cache.set(formula, PROPERTIES)
+
+    print(f"JSON encoder: {'orjson' if orjson else 'json (install orjson for the faster path)'}")
+    with TestClient(main.app) as client:
+        # Warm up both paths (fills the response cache and history)
+        for formula in FORMULAS * 5:
+            client.post("/molar-mass", json={"formula": formula})
+
+        cases = [
+            ("POST /molar-mass", lambda i: client.post("/legacy/molar-mass", json={"formula": FORMULAS[i % len(FORMULAS)]}),
+             lambda i: client.post("/molar-mass", json={"formula": FORMULAS[i % len(FORMULAS)]})),
+            ("GET /history?limit=100", lambda i: client.get("/legacy/history", params={"limit": 100}),
+             lambda i: client.get("/history", params={"limit": 100})),
+        ]
+        print(f"{'endpoint':<24}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+        for name, before, after in cases:
+            before_rps = requests_per_second(before, count)
+            after_rps = requests_per_second(after, count)
+            print(f"{name:<24}{before_rps:>14.1f}{after_rps:>14.1f}{after_rps / before_rps:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,124 @@
+"""
+Benchmark for the array-backed periodic table and composition vectors.
+
+Compares the previous dict-based path (regex tokens -> list of
+(element, count) tuples -> string-keyed atomic mass lookups) with
+periodic_table's count vectors, for single formulas, batch mass
+computation, dot products and composition arithmetic. Both sides of the
+batch case parse each distinct formula once, so it measures the parser
+rather than the deduplication.
+
+Usage:
+    python bench_periodic_table.py [repetitions]
+"""
+import re
+import sys
+import time
+
+sys.path.append('.')
+
+from periodic_table import ATOMIC_MASSES, MASSES, Composition, batch_molar_masses, parse_composition
+
+FORMULAS = [
+    "H2O", "CO2", "NaCl", "C6H12O6", "Ca(OH)2", "Al2(SO4)3", "K4Fe(CN)6",
+    "CH3(CH2)16COOH", "(Cr(N2H4CO)6)4(Cr(CN)6)3", "Fe2(SO4)3", "UF6", "C8H10N4O2",
+]
+
+
+def dict_parse_formula(formula):
+    """The dict-based parser previously in main.py."""
+    tokens = re.findall(r'[A-Z][a-z]?|\d+|\(|\)', formula)
+    stack = [[]]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if token == '(':
+            stack.append([])
+        elif token == ')':
+            group = stack.pop()
+            multiplier = 1
+            if i < len(tokens) and tokens[i].isdigit():
+                multiplier = int(tokens[i])
+                i += 1
+            for elem, count in group:
+                stack[-1].append((elem, count * multiplier))
+        elif re.match(r'[A-Z][a-z]?', token):
+            count = 1
+            if i < len(tokens) and tokens[i].isdigit():
+                count = int(tokens[i])
+                i += 1
+            stack[-1].append((token, count))
+    return stack[0]
+
+
+def dict_molar_mass(parsed):
+    total_mass = 0
+    for element, count in parsed:
+        if element not in ATOMIC_MASSES:
+            raise ValueError(f"Unknown element: {element}")
+        total_mass += ATOMIC_MASSES[element] * count
+    return total_mass
+
+
+def dict_batch_molar_masses(formulas):
+    """Batch masses over the dict path, deduplicated like batch_molar_masses."""
+    masses = {}
+    for formula in formulas:
+        if formula not in masses:
+            masses[formula] = dict_molar_mass(dict_parse_formula(formula))
+    return [masses[formula] for formula in formulas]
+
+
+def dict_add(a, b):
+    counts = dict(a)
+    for element, count in b.items():
+        counts[element] = counts.get(element, 0) + count
+    return counts
+
+
+def microseconds(func, repetitions: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - started) / repetitions * 1_000_000
+
+
+def main(repetitions: int) -> None:
+    for formula in FORMULAS:
+        old, new = dict_molar_mass(dict_parse_formula(formula)), parse_composition(formula).mass()
+        assert abs(old - new) < 1e-9, (formula, old, new)
+
+    dict_parsed = [dict_parse_formula(f) for f in FORMULAS]
+    vectors = [parse_composition(f) for f in FORMULAS]
+    dict_counts = [dict(Composition.from_items(p).items()) for p in dict_parsed]
+    batch = FORMULAS * 100
+    assert all(abs(a - b) < 1e-9 for a, b in zip(dict_batch_molar_masses(batch), batch_molar_masses(batch)))
+
+    cases = [
+        ("parse + mass (12 formulas)",
+         lambda: [dict_molar_mass(dict_parse_formula(f)) for f in FORMULAS],
+         lambda: [parse_composition(f).mass() for f in FORMULAS]),
+        ("mass of parsed (12)",
+         lambda: [dict_molar_mass(p) for p in dict_parsed],
+         lambda: [v.mass() for v in vectors]),
+        ("batch parse + mass (1200, 12 distinct)",
+         lambda: dict_batch_molar_masses(batch),
+         lambda: batch_molar_masses(batch)),
+        ("dot with masses (12)",
+         lambda: [dict_molar_mass(c.items()) for c in dict_counts],
+         lambda: [v.dot(MASSES) for v in vectors]),
+        ("add + scale (12)",
+         lambda: [dict_add(c, {e: n * 3 for e, n in c.items()}) for c in dict_counts],
+         lambda: [v + v.scale(3) for v in vectors]),
+    ]
+
+    print(f"{'operation':<40}{'dict us/op':>12}{'vector us/op':>14}{'speedup':>10}")
+    for name, before, after in cases:
+        old = microseconds(before, repetitions)
+        new = microseconds(after, repetitions)
+        print(f"{name:<40}{old:>12.1f}{new:>14.1f}{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,122 @@
+"""
+Background warm-up of the PubChem property cache from historical popularity.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+
+from database import FormulaHistory, SessionLocal
+from pubchem_api import PubChemAPI, property_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmup:
+    """
+    Prefetches properties for the most frequently calculated formulas.
+
+    Runs in a daemon thread so startup and request handling are not blocked,
+    and spaces PubChem lookups out to at most ``rate_per_second``.
+    """
+
+    def __init__(self, top_n: int = 100, rate_per_second: float = 1.0):
+        self.top_n = top_n
+        self.rate_per_second = rate_per_second
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.state = "idle"
+        self.total = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        """Start warming up in the background (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the warm-up thread to stop after its current lookup."""
+        self._stop.set()
+
+    def _popular_formulas(self) -> List[str]:
+        db = SessionLocal()
+        try:
+            count = func.count(FormulaHistory.id)
+            rows = (
+                db.query(FormulaHistory.formula, count)
+                .group_by(FormulaHistory.formula)
+                .order_by(count.desc())
+                .limit(self.top_n)
+                .all()
+            )
+            return [formula for formula, _ in rows]
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        self.state = "running"
+        self.started_at = datetime.now()
+        self.completed = self.skipped = self.failed = 0
+        try:
+            formulas = self._popular_formulas()
+            self.total = len(formulas)
+            interval = 1.0 / self.rate_per_second if self.rate_per_second > 0 else 0
+            for formula in formulas:
+                if self._stop.is_set():
+                    self.state = "stopped"
+                    return
+                if property_cache.contains(formula):
+                    self.skipped += 1
+                    continue
+                started = time.monotonic()
+                properties = PubChemAPI.fetch_compound_properties(formula)
+                if properties:
+                    property_cache.set(formula, properties)
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                # Wait out the rest of the interval, waking early on stop
+                self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+            self.state = "finished"
+            logger.info(
+                f"Cache warm-up finished: {self.completed} prefetched, "
+                f"{self.skipped} already cached, {self.failed} failed"
+            )
+        except Exception as e:
+            self.state = "failed"
+            logger.error(f"Cache warm-up failed: {str(e)}")
+        finally:
+            self.finished_at = datetime.now()
+
+    def status(self) -> Dict[str, Any]:
+        """Warm-up progress together with the current cache statistics."""
+        done = self.completed + self.skipped + self.failed
+        return {
+            "state": self.state,
+            "total": self.total,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "progress": round(done / self.total, 4) if self.total else None,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cache": property_cache.stats(),
+        }
+
+
+# Shared warm-up task started by the API on startup
+cache_warmup = CacheWarmup(
+    top_n=int(os.getenv("CACHE_WARMUP_TOP_N", "100")),
+    rate_per_second=float(os.getenv("CACHE_WARMUP_RATE", "1.0")),
+)
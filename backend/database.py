@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, func, text
+from sqlalchemy import create_engine, inspect, bindparam, or_, select, update, Column, Integer, String, Float, DateTime, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
@@ -8,6 +8,8 @@ import os
 import re
 import time
 
+from property_parser import parse_physical_properties
+
 
 # Load environment variables from .env file
 load_dotenv()
@@ -129,6 +131,76 @@ class FormulaHistory(Base):
     structure_image_url = Column(String(255), nullable=True)
     structure_image_svg_url = Column(String(255), nullable=True)
     compound_url = Column(String(255), nullable=True)
+    # Numeric values parsed from the text properties above, indexed for range queries
+    boiling_point_c = Column(Float, nullable=True, index=True)
+    boiling_point_pressure_mmhg = Column(Float, nullable=True)
+    melting_point_c = Column(Float, nullable=True, index=True)
+    density_g_cm3 = Column(Float, nullable=True, index=True)
+
+# Add columns/indexes introduced after the table was first created
+def add_missing_columns():
+    inspector = inspect(engine)
+    table = FormulaHistory.__table__
+    if not inspector.has_table(table.name):
+        return
+
+    existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+    added_columns = set()
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                added_columns.add(column.name)
+                print(f"Added missing column {table.name}.{column.name}")
+
+    if added_columns & set(PHYSICAL_PROPERTY_COLUMNS):
+        backfill_physical_properties()
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing_indexes:
+            index.create(bind=engine)
+            print(f"Created missing index {index.name}")
+
+# Numeric columns derived from the text properties by parse_physical_properties
+PHYSICAL_PROPERTY_COLUMNS = ("boiling_point_c", "boiling_point_pressure_mmhg", "melting_point_c", "density_g_cm3")
+
+# Fill the numeric property columns of existing rows from their text columns
+def backfill_physical_properties(batch_size=500):
+    table = FormulaHistory.__table__
+    text_columns = [table.c.boiling_point, table.c.melting_point, table.c.density]
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values({name: bindparam(f"new_{name}") for name in PHYSICAL_PROPERTY_COLUMNS})
+    )
+
+    last_id = 0
+    updated = 0
+    while True:
+        # One transaction per batch, walking the primary key
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, *text_columns)
+                .where(table.c.id > last_id, or_(*(column.isnot(None) for column in text_columns)))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            params = []
+            for row in rows:
+                values = parse_physical_properties(row._asdict())
+                if any(value is not None for value in values.values()):
+                    params.append({"row_id": row.id, **{f"new_{name}": value for name, value in values.items()}})
+            if params:
+                conn.execute(statement, params)
+                updated += len(params)
+
+    print(f"Backfilled numeric properties for {updated} rows")
 
 # Function to create all tables
 def create_tables():
@@ -161,6 +233,7 @@ def create_tables():
             
             # Now create the tables
             Base.metadata.create_all(bind=engine)
+            add_missing_columns()
             print(f"Database tables created successfully using connection: {SQLALCHEMY_DATABASE_URL}")
             return
             
@@ -0,0 +1,261 @@
+"""
+Chemical equation balancing using exact rational nullspace computation.
+
+An equation such as "Fe + O2 -> Fe2O3" is turned into an element-by-species
+matrix (reactant columns positive, product columns negative). Its nullspace,
+computed with Fractions, gives the coefficients, which are then scaled to
+the smallest positive integers.
+"""
+import re
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from functools import reduce
+from math import gcd, isfinite
+from typing import Callable, Dict, List, Optional, Tuple
+
+from periodic_table import SYMBOLS, Composition
+
+# Separators between the two sides of an equation
+_ARROW_RE = re.compile(r"\s*(?:<->|<=>|->|=>|→|⇌|=)\s*")
+# Optional coefficient written in front of a species, e.g. "2H2O"
+_COEFFICIENT_RE = re.compile(r"^(\d+)\s*(?=[A-Z(])")
+
+
+def _lcm(a: int, b: int) -> int:
+    return a * b // gcd(a, b)
+
+
+def nullspace(matrix: List[List[Fraction]], columns: int) -> List[List[Fraction]]:
+    """
+    Basis of the nullspace of ``matrix`` via reduced row echelon form.
+
+    Args:
+        matrix: Rows of Fractions (modified in place)
+        columns: Number of columns
+
+    Returns:
+        List of basis vectors, one per free column
+    """
+    pivots = []
+    row = 0
+    for col in range(columns):
+        pivot = next((r for r in range(row, len(matrix)) if matrix[r][col] != 0), None)
+        if pivot is None:
+            continue
+        matrix[row], matrix[pivot] = matrix[pivot], matrix[row]
+        lead = matrix[row][col]
+        matrix[row] = [value / lead for value in matrix[row]]
+        for r in range(len(matrix)):
+            if r != row and matrix[r][col] != 0:
+                factor = matrix[r][col]
+                matrix[r] = [a - factor * b for a, b in zip(matrix[r], matrix[row])]
+        pivots.append(col)
+        row += 1
+        if row == len(matrix):
+            break
+
+    basis = []
+    for free in (c for c in range(columns) if c not in pivots):
+        vector = [Fraction(0)] * columns
+        vector[free] = Fraction(1)
+        for r, col in enumerate(pivots):
+            vector[col] = -matrix[r][free]
+        basis.append(vector)
+    return basis
+
+
+def split_equation(equation: str) -> Tuple[List[str], List[str]]:
+    """
+    Split an equation into reactant and product formulas.
+    Coefficients already written in front of species are ignored.
+
+    Raises:
+        ValueError: If the equation does not have exactly two sides
+    """
+    sides = _ARROW_RE.split(equation.strip())
+    if len(sides) != 2 or not sides[0] or not sides[1]:
+        raise ValueError(f"Equation must have the form 'A + B -> C + D': {equation}")
+
+    def species(side: str) -> List[str]:
+        formulas = [_COEFFICIENT_RE.sub("", s.strip()) for s in side.split("+")]
+        if any(not f for f in formulas):
+            raise ValueError(f"Empty species in equation: {equation}")
+        return formulas
+
+    return species(sides[0]), species(sides[1])
+
+
+class EquationBalancer:
+    """
+    Balances equations and memoizes the coefficients per canonical reaction.
+
+    The canonical reaction is the sorted canonical formulas of each side, so
+    "O2 + Fe -> Fe2O3" reuses the nullspace computed for "Fe + O2 -> Fe2O3".
+    """
+
+    def __init__(self, parse_formula: Callable[[str], Composition], max_cached: int = 1000):
+        self.parse_formula = parse_formula
+        self.max_cached = max_cached
+        # Equation string -> full result, canonical reaction tuple -> coefficients
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _solve(self, compositions: List[Composition], reactant_count: int) -> List[int]:
+        """Smallest positive integer coefficients, in reactants + products order."""
+        reactant_elements = {z for c in compositions[:reactant_count] for z in c.nonzero()}
+        product_elements = {z for c in compositions[reactant_count:] for z in c.nonzero()}
+        if reactant_elements != product_elements:
+            missing = sorted(SYMBOLS[z] for z in reactant_elements ^ product_elements)
+            raise ValueError(f"Elements only on one side of the equation: {', '.join(missing)}")
+
+        # One row per element (atomic number), one column per species
+        matrix = [
+            [Fraction(c.counts[z] if i < reactant_count else -c.counts[z]) for i, c in enumerate(compositions)]
+            for z in sorted(reactant_elements)
+        ]
+        basis = nullspace(matrix, len(compositions))
+        if not basis:
+            raise ValueError("Equation cannot be balanced")
+        if len(basis) > 1:
+            raise ValueError("Equation has no unique balance (it combines independent reactions)")
+
+        vector = basis[0]
+        denominator = reduce(_lcm, (v.denominator for v in vector), 1)
+        integers = [int(v * denominator) for v in vector]
+        divisor = reduce(gcd, integers)
+        coefficients = [v // divisor for v in integers]
+        if coefficients[0] < 0:
+            coefficients = [-c for c in coefficients]
+        if any(c <= 0 for c in coefficients):
+            raise ValueError("Equation cannot be balanced with positive coefficients")
+        return coefficients
+
+    def _remember(self, key, value) -> None:
+        """Store a memoized result, evicting the least recently used. Caller must hold the lock."""
+        self._cache[key] = value
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, key):
+        """Memoized result for ``key`` or None, recording a hit."""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def coefficients(self, equation: str) -> Tuple[List[str], List[str], List[int], List[float]]:
+        """
+        Balance an equation, using memoized results when available.
+
+        Results are memoized both per equation string (skipping all parsing
+        on repeats) and per canonical reaction.
+
+        Returns:
+            Reactant formulas, product formulas, their coefficients and molar masses
+        """
+        equation = equation.strip()
+        memoized = self._lookup(equation)
+        if memoized is not None:
+            return memoized
+
+        reactants, products = split_equation(equation)
+        compositions = [self.parse_formula(f) for f in reactants + products]
+        canonical = [c.hill() for c in compositions]
+        if len(set(canonical)) != len(canonical):
+            raise ValueError("Each species may only appear once in an equation")
+        canonical_reactants, canonical_products = canonical[:len(reactants)], canonical[len(reactants):]
+        key = (tuple(sorted(canonical_reactants)), tuple(sorted(canonical_products)))
+
+        by_species = self._lookup(key)
+        if by_species is None:
+            solved = self._solve(compositions, len(reactants))
+            by_species = dict(zip(canonical, solved))
+            with self._lock:
+                self.misses += 1
+                self._remember(key, by_species)
+
+        result = (
+            reactants,
+            products,
+            [by_species[c] for c in canonical],
+            [round(c.mass(), 4) for c in compositions],
+        )
+        with self._lock:
+            self._remember(equation, result)
+        return result
+
+    def balance(self, equation: str, quantities: Optional[Dict[str, float]] = None) -> Dict:
+        """
+        Balance an equation and compute the masses involved.
+
+        Args:
+            equation: e.g. "Fe + O2 -> Fe2O3"
+            quantities: Optional grams of some species, keyed by formula as written.
+                The reaction extent is set by the limiting reactant (or, if only
+                products are given, the smallest product amount).
+
+        Returns:
+            Dict: Balanced equation, per-species coefficients and masses
+
+        Raises:
+            ValueError: If the equation cannot be balanced or a quantity is
+                negative, not finite or given for a species not in the equation
+        """
+        reactants, products, coefficients, masses = self.coefficients(equation)
+        species = reactants + products
+
+        extent = None
+        limiting = None
+        if quantities:
+            unknown = [f for f in quantities if f not in species]
+            if unknown:
+                raise ValueError(f"Quantities given for species not in the equation: {', '.join(unknown)}")
+            invalid = [f for f, grams in quantities.items() if not isfinite(grams) or grams < 0]
+            if invalid:
+                raise ValueError(f"Quantities must be finite and not negative: {', '.join(invalid)}")
+            given = [f for f in reactants if f in quantities] or [f for f in products if f in quantities]
+            for formula in given:
+                i = species.index(formula)
+                candidate = quantities[formula] / (coefficients[i] * masses[i])
+                if extent is None or candidate < extent:
+                    extent, limiting = candidate, formula
+
+        def amounts(start: int, formulas: List[str]) -> List[Dict]:
+            result = []
+            for offset, formula in enumerate(formulas):
+                i = start + offset
+                entry = {
+                    "formula": formula,
+                    "coefficient": coefficients[i],
+                    "molar_mass": masses[i],
+                    "mass_per_reaction": round(coefficients[i] * masses[i], 4),
+                    "moles": None,
+                    "grams": None,
+                }
+                if extent is not None:
+                    entry["moles"] = round(coefficients[i] * extent, 6)
+                    entry["grams"] = round(coefficients[i] * extent * masses[i], 4)
+                result.append(entry)
+            return result
+
+        def side(start: int, formulas: List[str]) -> str:
+            return " + ".join(
+                (str(coefficients[start + i]) if coefficients[start + i] != 1 else "") + f
+                for i, f in enumerate(formulas)
+            )
+
+        return {
+            "equation": f"{side(0, reactants)} -> {side(len(reactants), products)}",
+            "reactants": amounts(0, reactants),
+            "products": amounts(len(reactants), products),
+            "limiting_reagent": limiting if limiting in reactants else None,
+        }
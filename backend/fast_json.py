@@ -0,0 +1,34 @@
+"""
+JSON encoding for pre-serialized API responses.
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize ``obj`` to compact JSON bytes.
+
+    Args:
+        obj: Data made of dicts, lists, strings, numbers, None and datetimes
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
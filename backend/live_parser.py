@@ -0,0 +1,205 @@
+"""
+Incremental formula parser used by the live-calculation WebSocket.
+
+The parser keeps a snapshot of its state after every character, so when the
+user edits the end of the formula only the changed suffix is re-parsed.
+Snapshots share their count vectors: a vector is never modified once built,
+so each character costs at most one new vector rather than a copy of every
+open parenthesis level.
+"""
+from array import array
+from itertools import repeat
+from operator import add, mul
+from typing import Dict, List, Optional, Tuple
+
+from periodic_table import ATOMIC_NUMBERS, SIZE, Composition
+
+
+class FormulaSyntaxError(ValueError):
+    """Raised when a formula cannot be parsed, with the offending position."""
+
+    def __init__(self, message: str, position: int):
+        super().__init__(message)
+        self.position = position
+
+
+# Count vector of an empty level (shared, never modified)
+_EMPTY = Composition().counts
+
+
+class _ParseState:
+    """
+    Parser state after consuming some prefix of the input.
+
+    ``top`` is the count vector (indexed by atomic number) of the innermost
+    open parenthesis level and ``parents`` the enclosing levels as a linked
+    list of ``(counts, parents)`` pairs, so ``depth`` is the number of open
+    parentheses.
+    ``pending`` is the element or closed group waiting for its count, as
+    ``(kind, value, digits, start)``.
+
+    Count vectors are replaced rather than modified, so ``copy`` is shallow.
+    """
+    __slots__ = ("top", "parents", "depth", "pending")
+
+    def __init__(
+        self,
+        top: array,
+        parents: Optional[Tuple[array, Optional[tuple]]] = None,
+        depth: int = 0,
+        pending: Optional[tuple] = None,
+    ):
+        self.top = top
+        self.parents = parents
+        self.depth = depth
+        self.pending = pending
+
+    def copy(self) -> "_ParseState":
+        return _ParseState(self.top, self.parents, self.depth, self.pending)
+
+
+class IncrementalFormulaParser:
+    """
+    Character-level formula parser that reuses work across successive inputs.
+
+    Call ``feed`` with the full current text each time it changes; the result
+    is either the molar mass of what has been typed so far or the position of
+    the first syntax error. Input longer than ``max_length`` characters or
+    nested deeper than ``max_depth`` parentheses is rejected as an error.
+    """
+
+    def __init__(self, max_length: int = 200, max_depth: int = 16):
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self._prefixes = {symbol[:i] for symbol in ATOMIC_NUMBERS for i in range(1, len(symbol) + 1)}
+        self._text = ""
+        self._states: List[_ParseState] = [_ParseState(_EMPTY)]
+        self._error: Optional[FormulaSyntaxError] = None
+
+    def feed(self, text: str) -> Dict:
+        """
+        Parse ``text``, resuming from the longest prefix shared with the previous input.
+
+        Args:
+            text: Current contents of the formula input
+
+        Returns:
+            Dict: ``{"type": "result", ...}`` with the mass so far, or
+            ``{"type": "error", "position": ..., "detail": ...}``
+        """
+        if len(text) > self.max_length:
+            detail = f"Formula is longer than {self.max_length} characters"
+            return {"type": "error", "formula": text, "position": self.max_length, "detail": detail}
+
+        common = 0
+        limit = min(len(text), len(self._text), len(self._states) - 1)
+        while common < limit and text[common] == self._text[common]:
+            common += 1
+
+        del self._states[common + 1:]
+        self._text = text
+        self._error = None
+
+        state = self._states[common].copy()
+        try:
+            for pos in range(common, len(text)):
+                self._step(state, text[pos], pos)
+                self._states.append(state.copy())
+            counts, complete = self._finish(state, len(text))
+        except FormulaSyntaxError as e:
+            self._error = e
+            return {"type": "error", "formula": text, "position": e.position, "detail": str(e)}
+
+        molar_mass = Composition(counts).mass()
+        return {
+            "type": "result",
+            "formula": text,
+            "molar_mass": round(molar_mass, 4),
+            "unit": "g/mol",
+            "complete": complete,
+        }
+
+    def _step(self, state: _ParseState, char: str, pos: int) -> None:
+        """Advance ``state`` by one character."""
+        pending = state.pending
+        if "A" <= char <= "Z":
+            self._flush(state)
+            state.pending = ("element", char, "", pos)
+        elif "a" <= char <= "z":
+            if not pending or pending[0] != "element" or pending[2] or len(pending[1]) > 1:
+                raise FormulaSyntaxError(f"Unexpected lowercase letter '{char}' at position {pos}", pos)
+            symbol = pending[1] + char
+            if symbol not in self._prefixes:
+                raise FormulaSyntaxError(f"Unknown element: {symbol}", pending[3])
+            state.pending = ("element", symbol, "", pending[3])
+        elif "0" <= char <= "9":
+            if not pending:
+                raise FormulaSyntaxError(f"Unexpected number at position {pos}", pos)
+            if not pending[2] and char == "0":
+                raise FormulaSyntaxError(f"Count cannot start with 0 at position {pos}", pos)
+            state.pending = (pending[0], pending[1], pending[2] + char, pending[3])
+        elif char == "(":
+            self._flush(state)
+            if state.depth >= self.max_depth:
+                raise FormulaSyntaxError(f"Parentheses nested deeper than {self.max_depth} at position {pos}", pos)
+            state.parents = (state.top, state.parents)
+            state.top = _EMPTY
+            state.depth += 1
+        elif char == ")":
+            self._flush(state)
+            if not state.parents:
+                raise FormulaSyntaxError(f"Unbalanced parentheses at position {pos}", pos)
+            self._close(state, pos)
+        else:
+            raise FormulaSyntaxError(f"Invalid character '{char}' at position {pos}", pos)
+
+    @staticmethod
+    def _close(state: _ParseState, pos: int) -> None:
+        """Close the innermost level, leaving it pending as a group."""
+        state.pending = ("group", state.top, "", pos)
+        state.top, state.parents = state.parents
+        state.depth -= 1
+
+    def _flush(self, state: _ParseState) -> None:
+        """Apply the pending element or group to the innermost open level."""
+        if not state.pending:
+            return
+        kind, value, digits, start = state.pending
+        count = int(digits) if digits else 1
+        if kind == "element":
+            if value not in ATOMIC_NUMBERS:
+                raise FormulaSyntaxError(f"Unknown element: {value}", start)
+            top = state.top[:]
+            top[ATOMIC_NUMBERS[value]] += count
+            state.top = top
+        else:
+            state.top = array("l", map(add, state.top, map(mul, value, repeat(count, SIZE))))
+        state.pending = None
+
+    def _finish(self, state: _ParseState, end: int) -> tuple:
+        """
+        Collapse a state into a count vector and a completeness flag.
+
+        Unclosed groups are treated as closed and an element symbol that may
+        still be completed (e.g. ``Z`` before ``Zn``) is left out; both mark
+        the result as incomplete. ``state`` is left untouched.
+        """
+        state = state.copy()
+        outermost = state.top
+        parents = state.parents
+        while parents:
+            outermost, parents = parents
+        complete = any(outermost) or state.pending is not None
+        pending = state.pending
+        if pending and pending[0] == "element" and pending[1] not in ATOMIC_NUMBERS:
+            if pending[1] not in self._prefixes:
+                raise FormulaSyntaxError(f"Unknown element: {pending[1]}", pending[3])
+            state.pending = None
+            complete = False
+        self._flush(state)
+        if state.parents:
+            complete = False
+            while state.parents:
+                self._close(state, end)
+                self._flush(state)
+        return state.top, complete
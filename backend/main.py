@@ -1,16 +1,31 @@
+import asyncio
+import hashlib
 import json
 import os
 import re
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel
+from sqlalchemy import case, delete, func, update
 from sqlalchemy.orm import Session
 
-from database import FormulaHistory, create_tables, get_db
-from pubchem_api import get_chemical_properties
+from autocomplete import autocomplete_index
+from cache_warmup import cache_warmup
+from database import FormulaHistory, SessionLocal, create_tables, get_db
+from equation_balancer import EquationBalancer
+from fast_json import dumps
+from live_parser import IncrementalFormulaParser
+from periodic_table import Composition, batch_molar_masses, parse_composition
+from profiling import PROFILING_ENABLED, profile_store, profiled, profiling_middleware, require_admin
+from property_parser import parse_physical_properties
+from pubchem_api import PropertyCache, get_chemical_properties, property_cache
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -30,73 +45,28 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Load atomic mass data from JSON
-try:
-    with open("./atomic_masses.json") as file:
-        atomic_masses = json.load(file)
-except FileNotFoundError:
-    # Fallback to direct path if running from different directory
-    with open("atomic_masses.json") as file:
-        atomic_masses = json.load(file)
+# Per-request profiling (opt-in, see profiling.py)
+if PROFILING_ENABLED:
+    app.middleware("http")(profiling_middleware)
 
-def parse_formula(formula):
-    try:
-        tokens = re.findall(r'[A-Z][a-z]?|\d+|\(|\)', formula)
-        if not tokens:
-            raise ValueError(f"Invalid formula format: {formula}")
+def parse_formula(formula: str) -> Composition:
+    """
+    Parse a chemical formula into a composition vector.
+    
+    Args:
+        formula (str): Chemical formula, e.g. "Ca(OH)2"
         
-        stack = [[]]
-        i = 0
-
-        while i < len(tokens):
-            token = tokens[i]
-            i += 1  # Always increment i after accessing tokens[i]
-
-            if token == '(':
-                stack.append([])
-            elif token == ')':
-                if len(stack) <= 1:
-                    raise ValueError(f"Unbalanced parentheses in formula: {formula}")
-                    
-                group = stack.pop()
-                
-                # Check for a multiplier after the closing parenthesis
-                if i < len(tokens) and tokens[i].isdigit():
-                    multiplier = int(tokens[i])
-                    i += 1
-                else:
-                    multiplier = 1
-                    
-                # Apply the multiplier to all elements in the group
-                for elem, count in group:
-                    stack[-1].append((elem, count * multiplier))
-            elif re.match(r'[A-Z][a-z]?', token):
-                element = token
-                
-                # Check for a count after the element
-                if i < len(tokens) and tokens[i].isdigit():
-                    count = int(tokens[i])
-                    i += 1
-                else:
-                    count = 1
-                    
-                stack[-1].append((element, count))
-            elif token.isdigit():
-                # This handles cases where we have a digit without a preceding element
-                raise ValueError(f"Unexpected number in formula: {formula} at position {i-1}")
-            else:
-                # This should not happen with our regex pattern
-                raise ValueError(f"Invalid token in formula: {token}")
-
-        # Check for unbalanced parentheses
-        if len(stack) != 1:
-            raise ValueError(f"Unbalanced parentheses in formula: {formula}")
-            
-        return stack[0]  # Returns a list of (element, count) pairs from the top-level group
-    except Exception as e:
-        # Catch any other unexpected errors and provide a clear message
+    Returns:
+        Composition: Element counts indexed by atomic number
+        
+    Raises:
+        ValueError: If the formula is malformed or contains unknown elements
+    """
+    try:
+        return parse_composition(formula)
+    except ValueError as e:
         print(f"Error parsing formula '{formula}': {str(e)}")
-        raise ValueError(f"Error parsing formula: {str(e)}")
+        raise
 
 
 def calculate_molar_mass(formula: str) -> float:
@@ -112,13 +82,7 @@ def calculate_molar_mass(formula: str) -> float:
     Raises:
         ValueError: If formula contains unknown elements
     """
-    parsed = parse_formula(formula)
-    total_mass = 0
-    for element, count in parsed:
-        if element not in atomic_masses:
-            raise ValueError(f"Unknown element: {element}")
-        total_mass += atomic_masses[element] * count
-    return total_mass
+    return parse_formula(formula).mass()
 
 
 # Pydantic models for request/response validation
@@ -158,10 +122,104 @@ class FormulaHistoryModel(BaseModel):
     structure_image_url: Optional[str] = None
     structure_image_svg_url: Optional[str] = None
     compound_url: Optional[str] = None
+    boiling_point_c: Optional[float] = None
+    boiling_point_pressure_mmhg: Optional[float] = None
+    melting_point_c: Optional[float] = None
+    density_g_cm3: Optional[float] = None
     
     class Config:
         orm_mode = True
 
+
+class PropertySearchResult(BaseModel):
+    """Compound matched by a numeric property range query"""
+    formula: str
+    iupac_name: Optional[str] = None
+    value: float
+    unit: str
+    text: Optional[str] = None
+
+
+class HistoryFilter(BaseModel):
+    """Selects history rows by ID list and/or formula, client IP and time range"""
+    ids: Optional[List[int]] = None
+    formula: Optional[str] = None
+    user_ip: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+
+class BulkUpdateItem(BaseModel):
+    """New formula for a single history row"""
+    id: int
+    formula: str
+
+
+class BulkUpdateRequest(BaseModel):
+    """
+    Request model for bulk history updates.
+    Either give per-row ``items``, or a ``formula`` applied to every row matched by ``filter``.
+    """
+    items: Optional[List[BulkUpdateItem]] = None
+    formula: Optional[str] = None
+    filter: Optional[HistoryFilter] = None
+
+
+class BulkMutationResponse(BaseModel):
+    """Response model for bulk history mutations"""
+    affected_rows: int
+    message: str
+
+
+class BalanceRequest(BaseModel):
+    """Request model for balancing a chemical equation"""
+    equation: str
+    quantities: Optional[Dict[str, float]] = None  # grams, keyed by formula as written
+
+
+class SpeciesAmount(BaseModel):
+    """Coefficient and masses of one species in a balanced equation"""
+    formula: str
+    coefficient: int
+    molar_mass: float
+    mass_per_reaction: float
+    moles: Optional[float] = None
+    grams: Optional[float] = None
+
+
+class BalanceResponse(BaseModel):
+    """Response model for a balanced chemical equation"""
+    equation: str
+    reactants: List[SpeciesAmount]
+    products: List[SpeciesAmount]
+    limiting_reagent: Optional[str] = None
+
+
+class BatchBalanceRequest(BaseModel):
+    """Request model for balancing several equations at once"""
+    reactions: List[BalanceRequest]
+
+
+class BatchBalanceResult(BaseModel):
+    """Result (or error) for one equation of a batch"""
+    result: Optional[BalanceResponse] = None
+    error: Optional[str] = None
+
+
+class AutocompleteSuggestion(BaseModel):
+    """Model for a single autocomplete suggestion"""
+    formula: str
+    iupac_name: Optional[str] = None
+    count: int
+
+# Serialized compound responses keyed by formula: (body, molar mass, properties, ETag).
+# Entries are stored with the timestamp of the property cache entry they were built
+# from, so with the same TTL a cached body never outlives the properties in it.
+response_cache = PropertyCache(max_size=property_cache.max_size, ttl_seconds=property_cache.ttl_seconds)
+
+# Columns returned by /history (everything in FormulaHistoryModel)
+HISTORY_COLUMNS = [column for column in FormulaHistory.__table__.columns if column.name != "user_ip"]
+
 # Validate chemical formula format
 def validate_formula(formula):
     # Basic validation to catch obvious errors
@@ -183,39 +241,84 @@ def validate_formula(formula):
     
     return formula
 
+def canonical_formula(formula: str) -> str:
+    """Canonical (Hill notation) form of a formula, e.g. "Ca(OH)2" -> "CaH2O2"."""
+    return parse_formula(formula).hill()
+
+
+def _compound_etag(formula: str, properties: Dict) -> str:
+    """
+    Strong ETag for a compound response, derived from the canonical formula
+    and a digest of its properties (the property version). The formula as
+    written is included too, since the response body echoes it.
+    """
+    property_version = hashlib.sha256(json.dumps(properties, sort_keys=True).encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(f"{canonical_formula(formula)}:{formula}:{property_version}".encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _compound_response(formula: str) -> Tuple[bytes, float, Dict, str]:
+    """
+    Build (or fetch from response_cache) the serialized FormulaResponse for a formula.
+
+    Returns:
+        Tuple of JSON body, molar mass, PubChem properties and ETag
+    """
+    # Fast path: reuse the serialized response for formulas seen recently
+    cached = response_cache.get(formula)
+    if cached:
+        return cached
+
+    # Calculate molar mass
+    molar_mass = calculate_molar_mass(formula)
+    
+    # Fetch physical/chemical properties from PubChem API. Note when the cached
+    # properties were stored first (or, if they are about to be fetched, a time
+    # no later than that) so the response expires with them
+    stored_at = property_cache.stored_at(formula)
+    if stored_at is None:
+        stored_at = time.monotonic()
+    properties = get_chemical_properties(formula)
+    
+    # Create result with properties (use values from API if available)
+    result = {
+        "formula": formula,
+        "molar_mass": round(molar_mass, 4),
+        "unit": "g/mol",
+        "boiling_point": properties.get("boiling_point"),
+        "melting_point": properties.get("melting_point"),
+        "density": properties.get("density"),
+        "state_at_room_temp": properties.get("state_at_room_temp"),
+        "iupac_name": properties.get("iupac_name"),
+        "hazard_classification": properties.get("hazard_classification"),
+        "structure_image_url": properties.get("structure_image_url"),
+        "structure_image_svg_url": properties.get("structure_image_svg_url"),
+        "compound_url": properties.get("compound_url")
+    }
+
+    # The result is built from trusted data, so serialize it directly
+    # instead of validating it through FormulaResponse again
+    entry = (dumps(result), molar_mass, properties, _compound_etag(formula, properties))
+    if properties:
+        response_cache.set(formula, entry, stored_at=stored_at)
+    return entry
+
+
 # API endpoint for molar mass calculation
 @app.post("/molar-mass", response_model=FormulaResponse)
+@profiled
 def get_molar_mass(request: FormulaRequest, db: Session = Depends(get_db), req: Request = None):
     try:
         # Validate formula format first
         validate_formula(request.formula)
-        
-        # Calculate molar mass
-        molar_mass = calculate_molar_mass(request.formula)
-        
-        # Fetch physical/chemical properties from PubChem API
-        properties = get_chemical_properties(request.formula)
-        
-        # Create result with properties (use values from API if available)
-        result = {
-            "formula": request.formula,
-            "molar_mass": round(molar_mass, 4),
-            "unit": "g/mol",
-            "boiling_point": properties.get("boiling_point"),
-            "melting_point": properties.get("melting_point"),
-            "density": properties.get("density"),
-            "state_at_room_temp": properties.get("state_at_room_temp"),
-            "iupac_name": properties.get("iupac_name"),
-            "hazard_classification": properties.get("hazard_classification"),
-            "structure_image_url": properties.get("structure_image_url"),
-            "structure_image_svg_url": properties.get("structure_image_svg_url"),
-            "compound_url": properties.get("compound_url")
-        }
+
+        body, molar_mass, properties, _ = _compound_response(request.formula)
         
         # Save to database (non-critical operation)
         _save_to_database(db, request.formula, molar_mass, properties, req)
-        
-        return result
+        autocomplete_index.add(request.formula, properties.get("iupac_name"))
+
+        return Response(content=body, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -247,7 +350,8 @@ def _save_to_database(db: Session, formula: str, molar_mass: float, properties:
             hazard_classification=properties.get("hazard_classification"),
             structure_image_url=properties.get("structure_image_url"),
             structure_image_svg_url=properties.get("structure_image_svg_url"),
-            compound_url=properties.get("compound_url")
+            compound_url=properties.get("compound_url"),
+            **parse_physical_properties(properties)
         )
         db.add(db_formula)
         db.commit()
@@ -258,8 +362,194 @@ def _save_to_database(db: Session, formula: str, molar_mass: float, properties:
 # Get formula history
 @app.get("/history", response_model=List[FormulaHistoryModel])
 def get_history(limit: int = 10, db: Session = Depends(get_db)):
-    formulas = db.query(FormulaHistory).order_by(FormulaHistory.timestamp.desc()).limit(limit).all()
-    return formulas
+    # Select plain column tuples and serialize them directly, skipping ORM
+    # object construction and per-row FormulaHistoryModel validation
+    rows = db.query(*HISTORY_COLUMNS).order_by(FormulaHistory.timestamp.desc()).limit(limit).all()
+    return Response(content=dumps([row._asdict() for row in rows]), media_type="application/json")
+
+
+# Seconds the live channel waits for typing to pause before fetching PubChem properties
+LIVE_ENRICH_DEBOUNCE_SECONDS = float(os.getenv("LIVE_ENRICH_DEBOUNCE_SECONDS", "0.6"))
+# Longest formula and deepest parenthesis nesting the live channel will parse
+LIVE_MAX_FORMULA_LENGTH = int(os.getenv("LIVE_MAX_FORMULA_LENGTH", "200"))
+LIVE_MAX_NESTING_DEPTH = int(os.getenv("LIVE_MAX_NESTING_DEPTH", "16"))
+
+
+# Live calculation channel: mass (or parse error position) on every keystroke
+@app.websocket("/ws/molar-mass")
+async def live_molar_mass(websocket: WebSocket):
+    """
+    Stream molar masses for partial formulas as the user types.
+
+    The client sends ``{"formula": "..."}`` whenever the input changes and gets
+    back a ``result`` or ``error`` message straight away. Once the formula is
+    complete and unchanged for the debounce period, a ``properties`` message
+    with PubChem data follows. Malformed messages get an ``error`` reply and
+    the connection stays open. Nothing is written to history.
+    """
+    await websocket.accept()
+    parser = IncrementalFormulaParser(LIVE_MAX_FORMULA_LENGTH, LIVE_MAX_NESTING_DEPTH)
+    enrich_task = None
+    try:
+        while True:
+            try:
+                # KeyError: binary frame; ValueError: invalid JSON
+                message = json.loads(await websocket.receive_text())
+                formula = message.get("formula", "") if isinstance(message, dict) else None
+            except (KeyError, ValueError):
+                formula = None
+            if not isinstance(formula, str):
+                await websocket.send_json({
+                    "type": "error",
+                    "formula": None,
+                    "position": None,
+                    "detail": 'Messages must be JSON objects like {"formula": "H2O"}',
+                })
+                continue
+            formula = formula.strip()
+
+            try:
+                result = parser.feed(formula)
+            except Exception as e:
+                print(f"Live parse error: {str(e)}")
+                result = {
+                    "type": "error",
+                    "formula": formula,
+                    "position": None,
+                    "detail": f"Error parsing formula: {str(e)}",
+                }
+            await websocket.send_json(result)
+
+            if enrich_task:
+                enrich_task.cancel()
+                enrich_task = None
+            if result["type"] == "result" and result["complete"]:
+                enrich_task = asyncio.create_task(_enrich_after_debounce(websocket, formula))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if enrich_task:
+            enrich_task.cancel()
+
+
+async def _enrich_after_debounce(websocket: WebSocket, formula: str) -> None:
+    """
+    Send PubChem properties for ``formula`` unless cancelled by a newer keystroke.
+
+    Args:
+        websocket: Live calculation connection
+        formula: Complete formula to enrich
+    """
+    await asyncio.sleep(LIVE_ENRICH_DEBOUNCE_SECONDS)
+    try:
+        properties = await run_in_threadpool(get_chemical_properties, formula)
+        await websocket.send_json({"type": "properties", "formula": formula, **properties})
+    except Exception as e:
+        print(f"Live enrichment error (non-critical): {str(e)}")
+
+
+# Suggest formulas / IUPAC names from the in-memory prefix index
+@app.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete(q: str, limit: int = 10):
+    return autocomplete_index.search(q, min(limit, 50))
+
+
+# Balances equations; coefficients are memoized per canonical reaction
+equation_balancer = EquationBalancer(parse_formula)
+
+
+# Balance a chemical equation and compute reactant/product masses
+@app.post("/balance", response_model=BalanceResponse)
+def balance_equation(request: BalanceRequest):
+    try:
+        return equation_balancer.balance(request.equation, request.quantities)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error balancing equation: {str(e)}")
+
+
+# Balance several equations; errors are reported per equation
+@app.post("/balance/batch", response_model=List[BatchBalanceResult])
+def balance_equations(request: BatchBalanceRequest):
+    results = []
+    for reaction in request.reactions:
+        try:
+            results.append({"result": equation_balancer.balance(reaction.equation, reaction.quantities)})
+        except ValueError as e:
+            results.append({"error": str(e)})
+        except Exception as e:
+            results.append({"error": f"Error balancing equation: {str(e)}"})
+    return results
+
+
+# Numeric property columns that can be range-queried: (numeric column, text column, unit)
+RANGE_PROPERTIES = {
+    "boiling_point": (FormulaHistory.boiling_point_c, FormulaHistory.boiling_point, "°C"),
+    "melting_point": (FormulaHistory.melting_point_c, FormulaHistory.melting_point, "°C"),
+    "density": (FormulaHistory.density_g_cm3, FormulaHistory.density, "g/cm³"),
+}
+
+
+# Find compounds by numeric property range (served by the property indexes)
+@app.get("/compounds/search", response_model=List[PropertySearchResult])
+def search_compounds_by_property(
+    property: str,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    if property not in RANGE_PROPERTIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown property: {property}. Use one of: {', '.join(RANGE_PROPERTIES)}",
+        )
+    value_column, text_column, unit = RANGE_PROPERTIES[property]
+
+    query = db.query(FormulaHistory.formula, FormulaHistory.iupac_name, value_column, text_column)
+    query = query.filter(value_column.isnot(None))
+    if min_value is not None:
+        query = query.filter(value_column >= min_value)
+    if max_value is not None:
+        query = query.filter(value_column <= max_value)
+    rows = query.distinct().order_by(value_column).limit(min(limit, 500)).all()
+
+    return [
+        {"formula": formula, "iupac_name": iupac_name, "value": value, "unit": unit, "text": text}
+        for formula, iupac_name, value, text in rows
+    ]
+
+
+# Cache-Control for GET /compounds/{formula}; nginx and browsers cache on this
+COMPOUND_CACHE_MAX_AGE = int(os.getenv("COMPOUND_CACHE_MAX_AGE", "3600"))
+
+
+# Idempotent, HTTP-cacheable variant of POST /molar-mass (does not record history)
+@app.get("/compounds/{formula}", response_model=FormulaResponse)
+def get_compound(formula: str, request: Request):
+    try:
+        validate_formula(formula)
+        body, _, properties, etag = _compound_response(formula)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+    headers = {"ETag": etag}
+    if properties:
+        headers["Cache-Control"] = f"public, max-age={COMPOUND_CACHE_MAX_AGE}"
+    else:
+        # PubChem lookup failed: let clients use it but always revalidate
+        headers["Cache-Control"] = "no-cache"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # Update formula in history
@@ -278,12 +568,17 @@ def update_formula(formula_id: int, request: FormulaRequest, db: Session = Depen
         molar_mass = calculate_molar_mass(request.formula)
         
         # Update the formula
+        previous_formula = db_formula.formula
         db_formula.formula = request.formula
         db_formula.molar_mass = round(molar_mass, 4)
         db_formula.timestamp = datetime.now()  # Update timestamp to current time
+        if request.formula != previous_formula:
+            for column, value in CLEARED_PROPERTIES.items():
+                setattr(db_formula, column, value)
         
         db.commit()
         db.refresh(db_formula)
+        _update_autocomplete(Counter([previous_formula]), Counter([request.formula]))
         
         return db_formula
     except ValueError as e:
@@ -301,14 +596,169 @@ def delete_formula(formula_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail=f"Formula with ID {formula_id} not found")
         
         # Delete the formula
+        formula = db_formula.formula
         db.delete(db_formula)
         db.commit()
+        autocomplete_index.remove(formula, 1)
         
         return {"message": f"Formula with ID {formula_id} deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting formula: {str(e)}")
 
 
+# PubChem text columns and the numbers parsed from them. They describe the old
+# compound once a row's formula changes, so formula updates clear them
+CLEARED_PROPERTIES = {
+    column: None
+    for column in (
+        "boiling_point", "melting_point", "density", "state_at_room_temp", "iupac_name",
+        "hazard_classification", "structure_image_url", "structure_image_svg_url", "compound_url",
+        "boiling_point_c", "boiling_point_pressure_mmhg", "melting_point_c", "density_g_cm3",
+    )
+}
+
+
+def _formula_counts(db: Session, conditions: list) -> Counter:
+    """Number of history rows per formula among the rows matching ``conditions``."""
+    count = func.count(FormulaHistory.id)
+    rows = db.query(FormulaHistory.formula, count).filter(*conditions).group_by(FormulaHistory.formula).all()
+    return Counter(dict(rows))
+
+
+def _update_autocomplete(before: Counter, after: Counter) -> None:
+    """
+    Apply committed history changes to the autocomplete index.
+
+    Args:
+        before: Rows per formula that were changed or deleted, before the change
+        after: Rows per formula that those rows hold now
+    """
+    delta = Counter(after)
+    delta.subtract(before)
+    for formula, count in delta.items():
+        if count > 0:
+            autocomplete_index.add(formula, count=count)
+        elif count < 0:
+            autocomplete_index.remove(formula, -count)
+
+
+def _history_conditions(history_filter: Optional[HistoryFilter]) -> list:
+    """
+    Translate a HistoryFilter into SQLAlchemy WHERE conditions.
+
+    Raises:
+        ValueError: If no filter criteria are given
+    """
+    conditions = []
+    if history_filter:
+        if history_filter.ids is not None:
+            conditions.append(FormulaHistory.id.in_(history_filter.ids))
+        if history_filter.formula:
+            conditions.append(FormulaHistory.formula == history_filter.formula)
+        if history_filter.user_ip:
+            conditions.append(FormulaHistory.user_ip == history_filter.user_ip)
+        if history_filter.start:
+            conditions.append(FormulaHistory.timestamp >= history_filter.start)
+        if history_filter.end:
+            conditions.append(FormulaHistory.timestamp <= history_filter.end)
+    if not conditions:
+        raise ValueError("At least one filter (ids, formula, user_ip, start, end) is required")
+    return conditions
+
+
+# Update many history rows in a single transaction
+@app.post("/history/bulk-update", response_model=BulkMutationResponse)
+def bulk_update_formulas(request: BulkUpdateRequest, db: Session = Depends(get_db)):
+    try:
+        now = datetime.now()
+        if request.items:
+            # Recompute each distinct formula once, as one batch
+            formulas = list(dict.fromkeys(item.formula for item in request.items))
+            for formula in formulas:
+                validate_formula(formula)
+            masses = {f: round(m, 4) for f, m in zip(formulas, batch_molar_masses(formulas))}
+
+            new_formulas = {item.id: item.formula for item in request.items}
+            matched = db.query(FormulaHistory.id, FormulaHistory.formula).filter(FormulaHistory.id.in_(new_formulas)).all()
+            before = Counter(formula for _, formula in matched)
+            after = Counter(new_formulas[row_id] for row_id, _ in matched)
+            statement = (
+                update(FormulaHistory)
+                .where(FormulaHistory.id.in_(new_formulas))
+                .values(
+                    formula=case(new_formulas, value=FormulaHistory.id),
+                    molar_mass=case({i: masses[f] for i, f in new_formulas.items()}, value=FormulaHistory.id),
+                    timestamp=now,
+                    **CLEARED_PROPERTIES,
+                )
+            )
+        elif request.formula:
+            validate_formula(request.formula)
+            molar_mass = round(calculate_molar_mass(request.formula), 4)
+            conditions = _history_conditions(request.filter)
+            before = _formula_counts(db, conditions)
+            after = Counter({request.formula: sum(before.values())})
+            statement = (
+                update(FormulaHistory)
+                .where(*conditions)
+                .values(formula=request.formula, molar_mass=molar_mass, timestamp=now, **CLEARED_PROPERTIES)
+            )
+        else:
+            raise ValueError("Either items or formula must be provided")
+
+        result = db.execute(statement.execution_options(synchronize_session=False))
+        db.commit()
+        _update_autocomplete(before, after)
+        return {"affected_rows": result.rowcount, "message": f"Updated {result.rowcount} formulas"}
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating formulas: {str(e)}")
+
+
+# Delete many history rows in a single transaction
+@app.post("/history/bulk-delete", response_model=BulkMutationResponse)
+def bulk_delete_formulas(history_filter: HistoryFilter, db: Session = Depends(get_db)):
+    try:
+        conditions = _history_conditions(history_filter)
+        before = _formula_counts(db, conditions)
+        statement = delete(FormulaHistory).where(*conditions)
+        result = db.execute(statement.execution_options(synchronize_session=False))
+        db.commit()
+        _update_autocomplete(before, Counter())
+        return {"affected_rows": result.rowcount, "message": f"Deleted {result.rowcount} formulas"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting formulas: {str(e)}")
+
+
+# Property cache warm-up progress and hit ratio
+@app.get("/cache/status")
+def get_cache_status():
+    status = cache_warmup.status()
+    status["response_cache"] = response_cache.stats()
+    return status
+
+
+# Recent request profiles (admin only)
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    return profile_store.list()
+
+
+# Profile as folded stacks, for flamegraph.pl / speedscope (admin only)
+@app.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return profile.folded()
+
+
 # Simple health check endpoint
 @app.get("/")
 def read_root():
@@ -339,3 +789,41 @@ def startup_db_client():
                 print("4. If you're running the app locally outside Docker but trying to connect to MySQL in Docker,")
                 print("   update your connection string to use 'localhost' instead of 'mysql'")
                 print("5. Try manually creating the database: CREATE DATABASE molar_mass_db;\n")
+
+
+@app.on_event("startup")
+def build_autocomplete_index():
+    """
+    Populate the autocomplete index from formula history.
+    Runs once at startup; new calculations and history edits update the index incrementally.
+    """
+    db = SessionLocal()
+    try:
+        count = func.count(FormulaHistory.id)
+        rows = (
+            db.query(FormulaHistory.formula, FormulaHistory.iupac_name, count)
+            .group_by(FormulaHistory.formula, FormulaHistory.iupac_name)
+            .order_by(count.desc())
+            .limit(autocomplete_index.max_entries * 2)
+            .all()
+        )
+        autocomplete_index.load(rows)
+    except Exception as e:
+        print(f"Warning: Could not build autocomplete index: {str(e)}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def start_cache_warmup():
+    """
+    Prefetch properties of the most popular formulas in the background.
+    Disabled with CACHE_WARMUP_ENABLED=false.
+    """
+    if os.getenv("CACHE_WARMUP_ENABLED", "true").lower() != "false":
+        cache_warmup.start()
+
+
+@app.on_event("shutdown")
+def stop_cache_warmup():
+    cache_warmup.stop()
@@ -0,0 +1,236 @@
+"""
+Shared periodic table and compact formula composition vectors.
+
+Element data lives in arrays indexed by atomic number, and a parsed formula
+is a fixed-size count vector (one slot per atomic number). Each composition
+also remembers its molar mass and which slots are non-zero, so mass lookups
+and element-wise add/scale only touch the elements actually present.
+"""
+import json
+import os
+import re
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Element symbols indexed by atomic number (index 0 is unused)
+SYMBOLS: Tuple[str, ...] = (
+    "", "H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne",
+    "Na", "Mg", "Al", "Si", "P", "S", "Cl", "Ar", "K", "Ca",
+    "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn",
+    "Ga", "Ge", "As", "Se", "Br", "Kr", "Rb", "Sr", "Y", "Zr",
+    "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd", "In", "Sn",
+    "Sb", "Te", "I", "Xe", "Cs", "Ba", "La", "Ce", "Pr", "Nd",
+    "Pm", "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm", "Yb",
+    "Lu", "Hf", "Ta", "W", "Re", "Os", "Ir", "Pt", "Au", "Hg",
+    "Tl", "Pb", "Bi", "Po", "At", "Rn", "Fr", "Ra", "Ac", "Th",
+    "Pa", "U", "Np", "Pu", "Am", "Cm", "Bk", "Cf", "Es", "Fm",
+    "Md", "No", "Lr", "Rf", "Db", "Sg", "Bh", "Hs", "Mt", "Ds",
+    "Rg", "Cn", "Nh", "Fl", "Mc", "Lv", "Ts", "Og",
+)
+SIZE = len(SYMBOLS)
+
+# Load atomic mass data from JSON next to this module
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "atomic_masses.json")) as file:
+    ATOMIC_MASSES: Dict[str, float] = json.load(file)
+
+# Atomic number of every element with a known mass
+ATOMIC_NUMBERS: Dict[str, int] = {
+    symbol: z for z, symbol in enumerate(SYMBOLS) if symbol in ATOMIC_MASSES
+}
+
+# Molar mass by atomic number (0.0 where no mass is known; such elements never parse)
+MASSES = array("d", (ATOMIC_MASSES.get(symbol, 0.0) for symbol in SYMBOLS))
+
+_ZEROS = array("l", bytes(SIZE * array("l").itemsize))
+_TOKEN_RE = re.compile(r"([A-Z][a-z]?)([0-9]*)|(\()|(\))([0-9]*)|(.)")
+
+
+class Composition:
+    """
+    Element counts of a formula as a fixed-size vector indexed by atomic number.
+
+    Compositions are treated as immutable: arithmetic returns new vectors.
+    The molar mass and the non-zero atomic numbers are cached alongside the
+    counts (computed on first use if not supplied).
+    """
+    __slots__ = ("counts", "_mass", "_nonzero")
+
+    def __init__(
+        self,
+        counts: Optional[array] = None,
+        mass: Optional[float] = None,
+        nonzero: Optional[Tuple[int, ...]] = None,
+    ):
+        if counts is None:
+            counts, mass, nonzero = _ZEROS[:], 0.0, ()
+        self.counts = counts
+        self._mass = mass
+        self._nonzero = nonzero
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, int]]) -> "Composition":
+        """Build from ``(element, count)`` pairs."""
+        counts = _ZEROS[:]
+        for element, count in items:
+            if element not in ATOMIC_NUMBERS:
+                raise ValueError(f"Unknown element: {element}")
+            counts[ATOMIC_NUMBERS[element]] += count
+        return cls(counts)
+
+    def __getitem__(self, element: str) -> int:
+        z = ATOMIC_NUMBERS.get(element)
+        return self.counts[z] if z is not None else 0
+
+    def nonzero(self) -> Tuple[int, ...]:
+        """Atomic numbers present in the formula, ascending."""
+        if self._nonzero is None:
+            self._nonzero = tuple(z for z, count in enumerate(self.counts) if count)
+        return self._nonzero
+
+    def __add__(self, other: "Composition") -> "Composition":
+        counts = self.counts[:]
+        other_counts = other.counts
+        ours = self._nonzero or self.nonzero()
+        theirs = other._nonzero or other.nonzero()
+        for z in theirs:
+            counts[z] += other_counts[z]
+        if ours != theirs:
+            ours = tuple(sorted({*ours, *theirs}))
+        return Composition(counts, self.mass() + other.mass(), ours)
+
+    def __mul__(self, factor: int) -> "Composition":
+        if not factor:
+            return Composition()
+        counts = self.counts[:]
+        for z in self._nonzero or self.nonzero():
+            counts[z] *= factor
+        return Composition(counts, self.mass() * factor, self._nonzero)
+
+    __rmul__ = scale = __mul__
+
+    def dot(self, weights: Sequence[float]) -> float:
+        """Dot product with a per-atomic-number weight vector."""
+        counts = self.counts
+        total = 0.0
+        for z in self._nonzero or self.nonzero():
+            total += counts[z] * weights[z]
+        return total
+
+    def mass(self) -> float:
+        """Molar mass in g/mol."""
+        if self._mass is None:
+            self._mass = self.dot(MASSES)
+        return self._mass
+
+    def items(self) -> List[Tuple[str, int]]:
+        """``(element, count)`` pairs in atomic-number order."""
+        return [(SYMBOLS[z], self.counts[z]) for z in self.nonzero()]
+
+    def hill(self) -> str:
+        """
+        Hill notation, e.g. "CaH2O2" for Ca(OH)2.
+        Carbon first, then hydrogen, then the other elements alphabetically;
+        without carbon all elements are alphabetical.
+        """
+        counts = dict(self.items())
+        if "C" in counts:
+            order = ["C"] + (["H"] if "H" in counts else []) + sorted(e for e in counts if e not in ("C", "H"))
+        else:
+            order = sorted(counts)
+        return "".join(e + (str(counts[e]) if counts[e] != 1 else "") for e in order)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Composition) and self.counts == other.counts
+
+    def __hash__(self) -> int:
+        return hash(self.counts.tobytes())
+
+    def __repr__(self) -> str:
+        return f"Composition({self.hill()!r})"
+
+
+def parse_composition(formula: str) -> Composition:
+    """
+    Parse a formula such as "Ca(OH)2" straight into a composition vector.
+    The molar mass is accumulated while parsing.
+
+    Args:
+        formula (str): Chemical formula
+
+    Returns:
+        Composition: Element counts
+
+    Raises:
+        ValueError: If the formula is malformed (including zero or zero-padded
+            counts) or contains unknown elements
+    """
+    # Counts of the innermost open parenthesis level (atomic number -> count) and
+    # its mass; enclosing levels wait on the stack. Positions are only worked
+    # out for error messages.
+    counts: Dict[int, int] = {}
+    mass = 0.0
+    stack: List[Tuple[Dict[int, int], float]] = []
+    for index, (element, count, open_paren, close_paren, multiplier, other) in enumerate(_TOKEN_RE.findall(formula)):
+        digits = count or multiplier
+        if digits and digits[0] == "0":
+            position = _token_position(formula, index, 2 if count else 5)
+            raise ValueError(f"Count cannot start with 0 in formula: {formula} at position {position}")
+        if element:
+            z = ATOMIC_NUMBERS.get(element)
+            if z is None:
+                raise ValueError(f"Unknown element: {element}")
+            n = int(count) if count else 1
+            counts[z] = counts.get(z, 0) + n
+            mass += MASSES[z] * n
+        elif open_paren:
+            stack.append((counts, mass))
+            counts, mass = {}, 0.0
+        elif close_paren:
+            if not stack:
+                raise ValueError(f"Unbalanced parentheses in formula: {formula}")
+            factor = int(multiplier) if multiplier else 1
+            group, group_mass = counts, mass
+            counts, mass = stack.pop()
+            for z, n in group.items():
+                counts[z] = counts.get(z, 0) + n * factor
+            mass += group_mass * factor
+        elif "0" <= other <= "9":
+            position = _token_position(formula, index, 6)
+            raise ValueError(f"Unexpected number in formula: {formula} at position {position}")
+        else:
+            raise ValueError(f"Invalid character '{other}' in formula: {formula}")
+
+    if stack:
+        raise ValueError(f"Unbalanced parentheses in formula: {formula}")
+    if not counts:
+        raise ValueError(f"Invalid formula format: {formula}")
+    vector = _ZEROS[:]
+    for z, n in counts.items():
+        vector[z] = n
+    return Composition(vector, mass, tuple(sorted(counts)))
+
+
+def _token_position(formula: str, index: int, group: int) -> int:
+    """Start of ``group`` in the ``index``-th token of ``formula``."""
+    return next(islice(_TOKEN_RE.finditer(formula), index, None)).start(group)
+
+
+def batch_molar_masses(formulas: Sequence[str]) -> List[float]:
+    """
+    Molar masses of many formulas, parsing each distinct formula once.
+
+    Args:
+        formulas: Chemical formulas (may repeat)
+
+    Returns:
+        List[float]: Molar mass of each formula in g/mol, in input order
+
+    Raises:
+        ValueError: If any formula is malformed or contains unknown elements
+    """
+    masses: Dict[str, float] = {}
+    for formula in formulas:
+        if formula not in masses:
+            masses[formula] = parse_composition(formula).mass()
+    return [masses[formula] for formula in formulas]
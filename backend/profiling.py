@@ -0,0 +1,177 @@
+"""
+Opt-in per-request profiling that records call trees as folded stacks.
+
+Profiling is enabled with PROFILING_ENABLED=true. A request is profiled when
+it carries an ``X-Profile`` header equal to ADMIN_TOKEN, or at random for a
+PROFILE_SAMPLE_RATE fraction of requests. Endpoints decorated with
+``@profiled`` are then traced with ``sys.setprofile`` and the result is kept
+in a ring buffer, in the folded format used by flamegraph.pl / speedscope.
+"""
+import contextvars
+import functools
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Header, HTTPException, Request
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+
+# Profile being recorded for the current request, if any
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+class RequestProfile:
+    """Call-tree profile of a single request."""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.timestamp = datetime.now()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        # Folded stack ("outer;inner;leaf") -> self time in seconds
+        self.stacks: Dict[str, float] = defaultdict(float)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "timestamp": self.timestamp,
+            "duration_ms": self.duration_ms,
+            "status_code": self.status_code,
+            "frames": len(self.stacks),
+        }
+
+    def folded(self) -> str:
+        """Render as folded stacks with self time in microseconds."""
+        lines = [
+            f"{stack} {int(seconds * 1_000_000)}"
+            for stack, seconds in sorted(self.stacks.items())
+            if seconds > 0
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class _CallTreeTracer:
+    """``sys.setprofile`` callback that accumulates self time per call path."""
+
+    def __init__(self, profile: RequestProfile):
+        self.profile = profile
+        self._stack: List[list] = []  # [path, start, time spent in children]
+
+    @staticmethod
+    def _label(frame, event: str, arg) -> str:
+        if event == "c_call":
+            module = getattr(arg, "__module__", None) or "builtins"
+            return f"{module}.{getattr(arg, '__qualname__', arg.__name__)}"
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def __call__(self, frame, event: str, arg) -> None:
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            parent = self._stack[-1][0] + ";" if self._stack else ""
+            self._stack.append([parent + self._label(frame, event, arg), now, 0.0])
+        elif self._stack:
+            path, start, children = self._stack.pop()
+            elapsed = now - start
+            self.profile.stacks[path] += elapsed - children
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+
+class ProfileStore:
+    """Ring buffer holding the most recent request profiles."""
+
+    def __init__(self, max_profiles: int):
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+
+profile_store = ProfileStore(PROFILE_BUFFER_SIZE)
+
+
+def _is_admin_token(value: Optional[str]) -> bool:
+    """Constant-time comparison of a header value with the ADMIN_TOKEN."""
+    if ADMIN_TOKEN is None or value is None:
+        return False
+    return hmac.compare_digest(value.encode(), ADMIN_TOKEN.encode())
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Trace a (sync) endpoint when the current request was selected for profiling.
+    Costs a single context variable lookup otherwise.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        previous = sys.getprofile()
+        sys.setprofile(_CallTreeTracer(profile))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.setprofile(previous)
+    return wrapper
+
+
+async def profiling_middleware(request: Request, call_next):
+    """
+    Select requests for profiling and store their profiles once complete.
+    Only registered when PROFILING_ENABLED is set.
+    """
+    requested = _is_admin_token(request.headers.get("X-Profile"))
+    if not requested and not (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+        return await call_next(request)
+
+    profile = RequestProfile(request.method, request.url.path)
+    token = _current_profile.set(profile)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current_profile.reset(token)
+    profile.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    profile.status_code = response.status_code
+    if profile.stacks:
+        profile_store.add(profile)
+        response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency guarding the profile endpoints with the ADMIN_TOKEN."""
+    if not PROFILING_ENABLED or ADMIN_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not _is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
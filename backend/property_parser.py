@@ -0,0 +1,154 @@
+"""
+Parsing of PubChem free-text physical properties into normalized numbers.
+
+PubChem returns strings such as "100 °C", "212 °F at 760 mm Hg" or
+"0.997 g/mL at 25 °C". These helpers extract temperatures in °C, densities
+in g/cm³ and the pressure condition in mmHg so they can be stored in
+numeric columns and range-queried.
+"""
+import re
+from typing import Any, Dict, Optional, Tuple
+
+# Optional sign, optional thousands separators ("1,413"), optional decimals
+_NUMBER = r"[-−]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+
+# e.g. "100 °C", "-78.5°C", "212 deg F", "373.15 K", "100-102 °C"
+_TEMPERATURE_RE = re.compile(
+    rf"({_NUMBER})(?:\s*(?:-|–|to)\s*{_NUMBER})?\s*(?:°|º|deg(?:rees?)?)?\s*([CFK])\b"
+)
+
+# e.g. "at 760 mm Hg", "@ 101.3 kPa", "at 1 atm"
+_PRESSURE_RE = re.compile(
+    rf"(?:at|@)\s*({_NUMBER})\s*(mm\s*Hg|torr|kPa|hPa|Pa|atm|bar|psi)\b",
+    re.IGNORECASE,
+)
+
+# e.g. "1.00 g/cm3", "0.997 g/mL", "1.98 g/L", "1000 kg/m³"
+_DENSITY_RE = re.compile(
+    rf"({_NUMBER})\s*(g/cm3|g/cm³|g/cu\s*cm|g/mL|g/ml|g/cc|g/L|g/l|kg/m3|kg/m³|kg/L)"
+)
+
+# Relative density is reported without units, e.g. "1.59 (water = 1)"
+_RELATIVE_DENSITY_RE = re.compile(
+    rf"^\s*(?:(?:relative density|specific gravity)[^:]*:\s*)?({_NUMBER})\b",
+    re.IGNORECASE,
+)
+
+_PRESSURE_TO_MMHG = {
+    "mmhg": 1.0,
+    "torr": 1.0,
+    "kpa": 7.50062,
+    "hpa": 0.750062,
+    "pa": 0.00750062,
+    "atm": 760.0,
+    "bar": 750.062,
+    "psi": 51.7149,
+}
+
+_DENSITY_TO_G_CM3 = {
+    "g/cm3": 1.0,
+    "g/cm³": 1.0,
+    "g/cu cm": 1.0,
+    "g/ml": 1.0,
+    "g/cc": 1.0,
+    "g/l": 0.001,
+    "kg/m3": 0.001,
+    "kg/m³": 0.001,
+    "kg/l": 1.0,
+}
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace("−", "-").replace(",", ""))
+
+
+def _significant(value: float, digits: int = 6) -> float:
+    """Round to ``digits`` significant figures (gas densities in g/cm³ are tiny)."""
+    return float(f"{value:.{digits}g}")
+
+
+def parse_pressure(text: Optional[str]) -> Optional[float]:
+    """
+    Extract the pressure condition from a property string.
+
+    Args:
+        text (str): PubChem property string
+
+    Returns:
+        Optional[float]: Pressure in mmHg, or None if no condition is given
+    """
+    if not text:
+        return None
+    match = _PRESSURE_RE.search(text)
+    if not match:
+        return None
+    unit = re.sub(r"\s+", "", match.group(2)).lower()
+    return round(_to_float(match.group(1)) * _PRESSURE_TO_MMHG[unit], 3)
+
+
+def parse_temperature(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parse a boiling/melting point string.
+
+    Args:
+        text (str): PubChem property string, e.g. "212 °F at 760 mm Hg"
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: Temperature in °C and pressure
+        in mmHg. For ranges the lower bound is used.
+    """
+    if not text:
+        return None, None
+    match = _TEMPERATURE_RE.search(text)
+    if not match:
+        return None, None
+    value = _to_float(match.group(1))
+    unit = match.group(2)
+    if unit == "F":
+        value = (value - 32) * 5 / 9
+    elif unit == "K":
+        value = value - 273.15
+    return round(value, 3), parse_pressure(text[match.end():])
+
+
+def parse_density(text: Optional[str]) -> Optional[float]:
+    """
+    Parse a density string.
+
+    Args:
+        text (str): PubChem property string, e.g. "0.997 g/mL at 25 °C"
+
+    Returns:
+        Optional[float]: Density in g/cm³. Unitless relative densities
+        (water = 1) are taken as g/cm³.
+    """
+    if not text:
+        return None
+    match = _DENSITY_RE.search(text)
+    if match:
+        unit = re.sub(r"\s+", " ", match.group(2)).lower()
+        return _significant(_to_float(match.group(1)) * _DENSITY_TO_G_CM3[unit])
+    match = _RELATIVE_DENSITY_RE.search(text)
+    if match:
+        return _significant(_to_float(match.group(1)))
+    return None
+
+
+def parse_physical_properties(properties: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    Convert the text properties returned by PubChem into numeric column values.
+
+    Args:
+        properties (Dict[str, Any]): Properties from get_chemical_properties
+
+    Returns:
+        Dict[str, Optional[float]]: Values keyed by FormulaHistory column name
+    """
+    boiling_point_c, boiling_point_pressure = parse_temperature(properties.get("boiling_point"))
+    melting_point_c, _ = parse_temperature(properties.get("melting_point"))
+    return {
+        "boiling_point_c": boiling_point_c,
+        "boiling_point_pressure_mmhg": boiling_point_pressure,
+        "melting_point_c": melting_point_c,
+        "density_g_cm3": parse_density(properties.get("density")),
+    }
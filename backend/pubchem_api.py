@@ -3,6 +3,10 @@ PubChem API integration for fetching physical and chemical properties of compoun
 """
 import requests
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
 # Configure logging
@@ -156,9 +160,82 @@ class PubChemAPI:
             logger.error(f"Unexpected error: {str(e)}")
             return properties
 
+class PropertyCache:
+    """
+    Thread-safe LRU cache of PubChem properties keyed by formula, with expiry.
+    Only non-empty results are stored so failed lookups are retried.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 24 * 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, formula: str) -> Optional[Dict[str, Any]]:
+        """Return cached properties and record a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(formula)
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(formula)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[formula]
+            self.misses += 1
+            return None
+
+    def contains(self, formula: str) -> bool:
+        """Check for a fresh entry without affecting hit/miss statistics."""
+        with self._lock:
+            entry = self._entries.get(formula)
+            return bool(entry) and time.monotonic() - entry[0] < self.ttl_seconds
+
+    def stored_at(self, formula: str) -> Optional[float]:
+        """``time.monotonic()`` at which a fresh entry was stored, or None."""
+        with self._lock:
+            entry = self._entries.get(formula)
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                return entry[0]
+            return None
+
+    def set(self, formula: str, properties: Dict[str, Any], stored_at: Optional[float] = None) -> None:
+        """
+        Store non-empty properties. ``stored_at`` backdates the entry so it
+        expires together with the data it was built from.
+        """
+        if not properties:
+            return
+        with self._lock:
+            self._entries[formula] = (time.monotonic() if stored_at is None else stored_at, properties)
+            self._entries.move_to_end(formula)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+# Shared cache used by get_chemical_properties
+property_cache = PropertyCache(
+    max_size=int(os.getenv("PROPERTY_CACHE_SIZE", "1000")),
+    ttl_seconds=float(os.getenv("PROPERTY_CACHE_TTL_SECONDS", str(24 * 3600))),
+)
+
 def get_chemical_properties(formula: str) -> Dict[str, Any]:
     """
     Convenience function to fetch properties for a chemical formula.
+    Results are served from the property cache when available.
     
     Args:
         formula (str): Chemical formula
@@ -166,4 +243,8 @@ def get_chemical_properties(formula: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Dictionary containing properties
     """
-    return PubChemAPI.fetch_compound_properties(formula)
+    properties = property_cache.get(formula)
+    if properties is None:
+        properties = PubChemAPI.fetch_compound_properties(formula)
+        property_cache.set(formula, properties)
+    return dict(properties)
@@ -1,52 +1,17 @@
-import re    # Python’s regular expressions module
-import json
+import os
+import sys
 
-# Load atomic mass data from JSON
-with open("atomic_masses.json") as file:
-    atomic_masses = json.load(file) 
+# Element data and the formula parser are shared with the backend API
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from periodic_table import parse_composition
 
-# Ca(OH)2   this will return [('Ca', 1), ('O', 2), ('H', 2)]
+# Ca(OH)2   this will return [('H', 2), ('O', 2), ('Ca', 1)]
 def parse_formula(formula):
-    tokens = re.findall(r'[A-Z][a-z]?|\d+|\(|\)', formula)   #re.findall(pattern, string)
-    stack = [[]]
-    i = 0
-
-    while i < len(tokens):
-        token = tokens[i]
-
-        if token == '(':
-            stack.append([])
-        elif token == ')':
-            group = stack.pop()
-            i += 1
-            multiplier = int(tokens[i]) if i < len(tokens) and tokens[i].isdigit() else 1
-            if i < len(tokens) and tokens[i].isdigit():
-                i += 1
-            for elem, count in group:
-                stack[-1].append((elem, count * multiplier))
-            continue  #this means Go back to the beginning of the while loop, skip the rest of the code below.
-        elif re.match(r'[A-Z][a-z]?', token):
-            element = token
-            i += 1
-            count = int(tokens[i]) if i < len(tokens) and tokens[i].isdigit() else 1
-            if i < len(tokens) and tokens[i].isdigit():
-                i += 1
-            stack[-1].append((element, count))
-            continue
-        else:
-            i += 1
-
-    return stack[0]  #This returns the top-level list, which holds the full parsed result of the formula.
+    return parse_composition(formula).items()   # (element, count) pairs in atomic-number order
 
 # Calculate molar mass based on parsed formula
 def calculate_molar_mass(formula):
-    parsed = parse_formula(formula)
-    total_mass = 0
-    for element, count in parsed:
-        if element not in atomic_masses:
-            raise ValueError(f"Unknown element: {element}")
-        total_mass += atomic_masses[element] * count
-    return total_mass
+    return parse_composition(formula).mass()   # dot product of element counts with atomic masses
 
 if __name__ == "__main__":
     formula = input("Enter a chemical formula (e.g., Ca(OH)2): ")